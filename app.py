@@ -1,8 +1,8 @@
 # app.py
 import os
+from functools import lru_cache
 from flask import Flask, render_template, request, jsonify
 import joblib
-import pandas as pd
 import numpy as np
 
 # Optional: health tips mapping. If you placed health_tips.py use it; otherwise fallback dict used below.
@@ -13,6 +13,19 @@ except Exception:
         "default": "Maintain a balanced diet, regular exercise, avoid smoking, and get routine health checks."
     }
 
+# Optional: orjson serializes the JSON responses; falls back to Flask's jsonify.
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+# Optional: Treelite runs the forests in native code. Without it (or if its
+# output disagrees with sklearn) the sklearn predict_proba path is used.
+try:
+    import treelite
+except Exception:
+    treelite = None
+
 # ----------------------------
 # Config / Paths
 # ----------------------------
@@ -44,9 +57,128 @@ rf_uci = joblib.load(UCI_MODEL_PATH)
 rf_fram = joblib.load(FRAM_MODEL_PATH)
 meta_model = joblib.load(META_MODEL_PATH)
 
+# Out-of-bag diagnostics a forest stores when trained with oob_score=True;
+# prediction never reads them. The shipped model_uci.pkl / model_fram.pkl were
+# trained with oob_score=False and carry none, so this only matters for
+# retrained artifacts.
+TRAINING_ONLY_ATTRS = ("oob_score_", "oob_decision_function_", "oob_prediction_")
+
+# Requests predict a single row, where joblib's worker dispatch costs more than
+# the trees themselves, so run inference in-process regardless of training n_jobs.
+for _model in (rf_uci, rf_fram, meta_model):
+    if hasattr(_model, "n_jobs"):
+        _model.n_jobs = 1
+    if hasattr(_model, "verbose"):
+        _model.verbose = 0
+
+# estimators_samples_ is recomputed on access, not stored, so there is nothing to drop for it
+for _rf in (rf_uci, rf_fram):
+    for _attr in TRAINING_ONLY_ATTRS:
+        vars(_rf).pop(_attr, None)
+
 # Feature lists as stored in the models (preserve training order)
-uci_features = [str(x) for x in rf_uci.feature_names_in_]
-fram_features = [str(x) for x in rf_fram.feature_names_in_]
+uci_features = tuple(str(x) for x in rf_uci.feature_names_in_.tolist())
+fram_features = tuple(str(x) for x in rf_fram.feature_names_in_.tolist())
+
+# The models are fed plain NumPy rows in the order captured above; without the
+# stored names sklearn skips its per-call feature-name check (and its warning).
+for _model in (rf_uci, rf_fram, meta_model):
+    if hasattr(_model, "feature_names_in_"):
+        del _model.feature_names_in_
+
+# sklearn trees compare in float32 internally, so float32 rows are used as-is
+# instead of being converted on every predict_proba call.
+INPUT_DTYPE = np.float32
+
+def split_probe_rows(rf, n_features, rounds=1, seed=0):
+    """
+    Probe rows for checking a compiled forest against sklearn. For each
+    feature, every split threshold rf uses appears both as the largest float32
+    at or below it (left branch) and the next float32 above it (right branch),
+    so both sides of every real split value, including the 0/1 and
+    small-category features, are compared. Columns are shuffled independently
+    to mix branches across features; features never split on stay 0.
+    """
+    rng = np.random.default_rng(seed)
+    features = np.concatenate([est.tree_.feature for est in rf.estimators_])
+    thresholds = np.concatenate([est.tree_.threshold for est in rf.estimators_])
+    sides = []
+    for f in range(n_features):
+        thr = np.unique(thresholds[features == f])
+        # largest float32 <= threshold goes left (x <= t), the next float32 goes right
+        below = thr.astype(np.float32)
+        below = np.where(below.astype(np.float64) > thr, np.nextafter(below, np.float32(-np.inf)), below)
+        above = np.nextafter(below, np.float32(np.inf))
+        sides.append(np.concatenate((below, above)))
+    n_rows = rounds * max(len(v) for v in sides)
+    probe = np.zeros((n_rows, n_features), dtype=np.float32)
+    for f, values in enumerate(sides):
+        if values.size:
+            probe[:, f] = rng.permutation(np.resize(values, n_rows))
+    return probe
+
+def compile_forest(rf, n_features):
+    """
+    Import a fitted sklearn forest into Treelite and check it reproduces
+    sklearn's class-1 probabilities on split-straddling probe rows. Returns a
+    (model, input dtype) pair, preferring float32 input when Treelite accepts
+    it, or None when Treelite is unavailable or the check fails.
+    """
+    if treelite is None:
+        return None
+    try:
+        tl_model = treelite.sklearn.import_model(rf)
+    except Exception:
+        return None
+    probe = split_probe_rows(rf, n_features).astype(INPUT_DTYPE)
+    expected = rf.predict_proba(probe)[:, 1]
+    for dtype in (np.float32, np.float64):
+        try:
+            got = treelite_positive_proba(tl_model, probe.astype(dtype))
+        except Exception:
+            continue
+        if np.allclose(got, expected, atol=1e-5):
+            return tl_model, dtype
+    return None
+
+def treelite_positive_proba(tl_model, X):
+    """Class-1 probability per row from a Treelite forest (GTIL predictor)."""
+    # Single-threaded, like n_jobs=1 on the sklearn path: thread fan-out costs
+    # more than a 1-row prediction and oversubscribes Gunicorn workers.
+    out = np.asarray(treelite.gtil.predict(tl_model, X, nthread=1))
+    return out.reshape(X.shape[0], -1)[:, -1]
+
+tl_uci = compile_forest(rf_uci, len(uci_features))
+tl_fram = compile_forest(rf_fram, len(fram_features))
+
+def linear_meta_params(model):
+    """
+    Return (w_uci, w_fram, bias) when the meta-model is a binary linear stacker
+    whose predict_proba is sigmoid(bias + w_uci*p_uci + w_fram*p_fram), checked
+    against predict_proba on probe points; otherwise None.
+    """
+    coef = getattr(model, "coef_", None)
+    intercept = getattr(model, "intercept_", None)
+    if coef is None or intercept is None or not hasattr(model, "predict_proba"):
+        return None
+    coef = np.asarray(coef, dtype=np.float64)
+    intercept = np.asarray(intercept, dtype=np.float64)
+    if coef.shape != (1, 2) or intercept.shape != (1,):
+        return None
+    w_uci, w_fram = float(coef[0, 0]), float(coef[0, 1])
+    bias = float(intercept[0])
+    probe = np.array([[0.0, 0.0], [1.0, 0.0], [0.0, 1.0], [0.3, 0.7], [1.0, 1.0]])
+    try:
+        expected = model.predict_proba(probe)[:, 1]
+    except Exception:
+        return None
+    got = 1.0 / (1.0 + np.exp(-(bias + probe @ np.array([w_uci, w_fram]))))
+    if not np.allclose(got, expected, atol=1e-9):
+        return None
+    return w_uci, w_fram, bias
+
+# Inline formula for a logistic meta-model; None keeps the predict_proba path
+META_LINEAR = linear_meta_params(meta_model)
 
 # ----------------------------
 # Form name ↔ model column mappings
@@ -81,7 +213,7 @@ FORM_TO_MODEL = {
     "heartRate": "heartRate",
     "totChol": "totChol",
     # NOTE: framingham model had 'glucose' in training; your form may not include it.
-    # If your form doesn't include glucose, it will be filled with 0 by reindexing.
+    # If your form doesn't include glucose, it will be filled with 0 when the model rows are built.
 }
 
 # Inverse mapping model col -> form name (for looking up values)
@@ -98,9 +230,23 @@ EXPECTED_FORM_FIELDS = [
     "exerciseAngina", "oldpeak", "stSlope"
 ]
 
+# Most 'modified_batch' entries a single JSON /predict request may score
+MAX_BATCH = 64
+
+# Expected form fields keyed by their normalized (no spaces, lower-case) name
+_NORMALIZED_KEY_INDEX = {k.replace(" ", "").lower(): k for k in EXPECTED_FORM_FIELDS}
+
+# Form key to read for each model column, in training order ('male' reads
+# 'sex'). Columns without a mapping (e.g. 'glucose') use their own name.
+UCI_FORM_KEYS = tuple(MODEL_TO_FORM.get(c, c) for c in uci_features)
+FRAM_FORM_KEYS = tuple(MODEL_TO_FORM.get(c, c) for c in fram_features)
+
 # ----------------------------
 # Helpers
 # ----------------------------
+# Boolean-like form strings (lower-cased) and their numeric value
+_BOOL_MAP = {"true": 1, "yes": 1, "y": 1, "false": 0, "no": 0, "n": 0}
+
 def to_number(v):
     """Convert form string to int/float where possible, else return 0 for empty."""
     if v is None:
@@ -108,71 +254,95 @@ def to_number(v):
     if isinstance(v, (int, float)):
         return v
     s = str(v).strip()
-    if s == "":
-        return 0
-    # boolean-like
-    if s.lower() in ("true", "yes", "y"):
-        return 1
-    if s.lower() in ("false", "no", "n"):
+    if not s:
         return 0
+    b = _BOOL_MAP.get(s.lower())
+    if b is not None:
+        return b
     try:
-        if "." in s:
-            return float(s)
         return int(s)
-    except:
-        # fallback: try float
-        try:
-            return float(s)
-        except:
-            return 0
+    except ValueError:
+        pass
+    try:
+        return float(s)
+    except ValueError:
+        return 0
 
 def build_user_inputs(form):
     """Collect all expected form fields and convert to numeric values."""
-    data = {}
-    for f in EXPECTED_FORM_FIELDS:
-        data[f] = to_number(form.get(f))
-    return data
+    return {f: to_number(form.get(f)) for f in EXPECTED_FORM_FIELDS}
 
-def build_model_dfs(user_inputs):
+def build_model_rows(user_inputs):
     """
-    Build two DataFrames (1 row) for UCI and Framingham models in the exact
-    column order the models expect. Missing columns are filled with 0.
+    Collect the values for the UCI and Framingham models as two tuples in the
+    exact column order the models expect. Missing columns are filled with 0.
+    The tuples are hashable, so they double as the prediction cache key.
     """
-    # Prepare dictionaries keyed by model column names
-    uci_input = {}
-    for col in uci_features:
-        # find corresponding form key
-        form_key = MODEL_TO_FORM.get(col, None)
-        if form_key:
-            uci_input[col] = user_inputs.get(form_key, 0)
-        else:
-            # sometimes form key is exactly same
-            uci_input[col] = user_inputs.get(col, 0)
-
-    fram_input = {}
-    for col in fram_features:
-        # model column 'male' maps to form 'sex'
-        if col == "male":
-            fram_input[col] = user_inputs.get("sex", 0)
-            continue
-        form_key = MODEL_TO_FORM.get(col, None)
-        if form_key:
-            fram_input[col] = user_inputs.get(form_key, 0)
-        else:
-            fram_input[col] = user_inputs.get(col, 0)
+    uci_row = tuple(float(user_inputs.get(k, 0)) for k in UCI_FORM_KEYS)
+    fram_row = tuple(float(user_inputs.get(k, 0)) for k in FRAM_FORM_KEYS)
+    return uci_row, fram_row
+
+def positive_proba(rf, compiled, X):
+    """Class-1 probabilities for rows X, via Treelite when it was compiled."""
+    if compiled is not None:
+        tl_model, dtype = compiled
+        return treelite_positive_proba(tl_model, X.astype(dtype, copy=False))
+    return rf.predict_proba(X)[:, 1]
+
+def get_probabilities(uci_X, fram_X):
+    """Return uci_probs, fram_probs as float arrays (0..1), one value per row."""
+    uci_probs = positive_proba(rf_uci, tl_uci, uci_X)
+    fram_probs = positive_proba(rf_fram, tl_fram, fram_X)
+    return uci_probs, fram_probs
+
+def get_final_probabilities(uci_probs, fram_probs):
+    """Meta-model probability per row from the base probabilities (columns p_uci, p_fram)."""
+    if META_LINEAR is not None:
+        w_uci, w_fram, bias = META_LINEAR
+        return 1.0 / (1.0 + np.exp(-(bias + w_uci * np.asarray(uci_probs, dtype=np.float64)
+                                     + w_fram * np.asarray(fram_probs, dtype=np.float64))))
+    meta_X = np.column_stack((uci_probs, fram_probs)).astype(np.float64)
+    try:
+        return meta_model.predict_proba(meta_X)[:, 1]
+    except Exception:
+        # if meta_model lacks predict_proba fallback to predict (0/1)
+        return meta_model.predict(meta_X).astype(np.float64)
 
-    uci_df = pd.DataFrame([uci_input])
-    fram_df = pd.DataFrame([fram_input])
-    # Ensure column order matches training models; fill missing columns with 0
-    uci_df = uci_df.reindex(columns=uci_features, fill_value=0)
-    fram_df = fram_df.reindex(columns=fram_features, fill_value=0)
-    return uci_df, fram_df
+def predict_batch(uci_X, fram_X):
+    """Return (uci_probs, fram_probs, final_probs) arrays for N stacked model rows."""
+    uci_probs, fram_probs = get_probabilities(uci_X, fram_X)
+    return uci_probs, fram_probs, get_final_probabilities(uci_probs, fram_probs)
 
-def get_probabilities(uci_df, fram_df):
-    """Return uci_prob, fram_prob as floats (0..1)."""
-    uci_prob = float(rf_uci.predict_proba(uci_df)[0][1])
-    fram_prob = float(rf_fram.predict_proba(fram_df)[0][1])
-    return uci_prob, fram_prob
+@lru_cache(maxsize=4096)
+def predict_rows(uci_row, fram_row):
+    """
+    Return (uci_prob, fram_prob, final_prob) for one pair of model rows.
+    Slider updates resend mostly identical inputs, so results are memoized;
+    call predict_rows.cache_clear() if the models are ever reloaded.
+    """
+    uci_X = np.array(uci_row, dtype=INPUT_DTYPE).reshape(1, -1)
+    fram_X = np.array(fram_row, dtype=INPUT_DTYPE).reshape(1, -1)
+    uci_probs, fram_probs, final_probs = predict_batch(uci_X, fram_X)
+    return float(uci_probs[0]), float(fram_probs[0]), float(final_probs[0])
+
+def predict_many(inputs_list):
+    """
+    Run every user_inputs dict in inputs_list through the models with one
+    predict_proba call per model. Returns a list of result dicts.
+    """
+    rows = [build_model_rows(u) for u in inputs_list]
+    uci_X = np.array([r[0] for r in rows], dtype=INPUT_DTYPE)
+    fram_X = np.array([r[1] for r in rows], dtype=INPUT_DTYPE)
+    uci_probs, fram_probs, final_probs = predict_batch(uci_X, fram_X)
+    return [
+        {
+            "uci_prob": round(float(u), 4),
+            "fram_prob": round(float(f), 4),
+            "final_prob": round(float(p), 4),
+            "final_cat": risk_category(float(p)),
+        }
+        for u, f, p in zip(uci_probs, fram_probs, final_probs)
+    ]
 
 def risk_category(prob):
     if prob < 0.4:
@@ -187,19 +357,31 @@ def combine_feature_importances(top_n=10):
     Create a combined ranking of features using RF feature_importances_ from both models.
     Returns top_n model feature names (strings), in descending combined importance.
     """
-    # Get importances mapping
-    imp_uci = dict(zip(uci_features, rf_uci.feature_importances_))
-    imp_fram = dict(zip(fram_features, rf_fram.feature_importances_))
+    # Union of feature names, UCI first (keeps the original tie order)
+    names = list(dict.fromkeys(uci_features + fram_features))
+    position = {name: i for i, name in enumerate(names)}
     # Combine by simple addition (features unique to one model still included)
-    combined = {}
-    for k, v in imp_uci.items():
-        combined[k] = combined.get(k, 0.0) + float(v)
-    for k, v in imp_fram.items():
-        combined[k] = combined.get(k, 0.0) + float(v)
-    # Sort descending
-    sorted_feats = sorted(combined.items(), key=lambda x: x[1], reverse=True)
-    top_feats = [f for f, _ in sorted_feats[:top_n]]
-    return top_feats
+    combined = np.zeros(len(names), dtype=np.float64)
+    combined[[position[f] for f in uci_features]] += rf_uci.feature_importances_
+    combined[[position[f] for f in fram_features]] += rf_fram.feature_importances_
+    # Sort descending; stable so equal importances keep first-seen order
+    order = np.argsort(-combined, kind="stable")[:top_n]
+    return [names[i] for i in order]
+
+def merge_modified_inputs(base, modified):
+    """
+    Return a copy of base (form-keyed numeric inputs) with modified applied.
+    Modified keys may be model column names or form keys.
+    """
+    merged = dict(base)
+    for k, v in modified.items():
+        # if modified key is a model column name and maps to a form key, set the form key
+        if k in MODEL_TO_FORM:
+            merged[MODEL_TO_FORM[k]] = to_number(v)
+        else:
+            # otherwise set directly — build_model_rows can fallback on model column names
+            merged[k] = to_number(v)
+    return merged
 
 def get_value_for_feature_name(feature_name, user_inputs):
     """
@@ -214,21 +396,49 @@ def get_value_for_feature_name(feature_name, user_inputs):
     if feature_name == "male" and "sex" in user_inputs:
         return user_inputs.get("sex")
     # try normalized match: remove spaces and case
-    normalized = feature_name.replace(" ", "").lower()
-    for k, v in user_inputs.items():
-        if k.replace(" ", "").lower() == normalized:
-            return v
-    # fallback 0
-    return 0
+    form_key = _NORMALIZED_KEY_INDEX.get(feature_name.replace(" ", "").lower())
+    if form_key in user_inputs:
+        return user_inputs[form_key]
+    # JSON updates may carry model-only columns (e.g. 'glucose') under their own name; else 0
+    return user_inputs.get(feature_name, 0)
+
+def get_tip_for_feature(f):
+    """HEALTH_TIPS entry for a model-style feature name, falling back to default."""
+    # try multiple keys in HEALTH_TIPS
+    return HEALTH_TIPS.get(f) or HEALTH_TIPS.get(f.lower()) or HEALTH_TIPS.get(MODEL_TO_FORM.get(f, ""), None) or HEALTH_TIPS.get("default")
+
+# Tip text for every model feature, resolved once (HEALTH_TIPS is static)
+TIP_BY_FEATURE = {f: get_tip_for_feature(f) for f in dict.fromkeys(uci_features + fram_features)}
 
 def get_dynamic_tips(features_list):
     """Return list of dicts: {"feature": name, "tip": text} using HEALTH_TIPS fallback to default."""
-    tips_out = []
-    for f in features_list:
-        # try multiple keys in HEALTH_TIPS
-        tip = HEALTH_TIPS.get(f) or HEALTH_TIPS.get(f.lower()) or HEALTH_TIPS.get(MODEL_TO_FORM.get(f, ""), None) or HEALTH_TIPS.get("default")
-        tips_out.append({"feature": f, "tip": tip})
-    return tips_out
+    return [{"feature": f, "tip": TIP_BY_FEATURE.get(f) or get_tip_for_feature(f)} for f in features_list]
+
+# The forests are fixed after load, so the importance ranking and the tips
+# derived from it are computed once here instead of on every request.
+TOP_FEATURES_CACHED = combine_feature_importances(top_n=10)
+TIPS_CACHED = get_dynamic_tips(TOP_FEATURES_CACHED)
+
+def warmup():
+    """Run one dummy row through every model so the first real request skips lazy setup."""
+    predict_batch(np.zeros((1, len(uci_features)), dtype=INPUT_DTYPE),
+                  np.zeros((1, len(fram_features)), dtype=INPUT_DTYPE))
+
+warmup()
+
+def build_top_feature_payload(user_inputs):
+    """
+    Single pass over the cached top features: list of dicts {"name", "value"}
+    used to prefill the sliders. Tips are static and come from TIPS_CACHED.
+    """
+    return [{"name": f, "value": get_value_for_feature_name(f, user_inputs)} for f in TOP_FEATURES_CACHED]
+
+def json_response(data, status=200):
+    """JSON response for data, encoded with orjson when it is installed."""
+    if orjson is not None:
+        return app.response_class(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY),
+                                  status=status, mimetype="application/json")
+    return jsonify(data), status
 
 # ----------------------------
 # Routes
@@ -242,81 +452,66 @@ def predict():
     """
     Handles standard form POST (from index.html) and returns result.html rendering.
     For the slider updates (if you implement AJAX later), we kept this route simple:
-    it can also accept JSON with 'base_inputs' and 'modified' keys (optional).
+    it can also accept JSON with 'base_inputs' and 'modified' keys (optional), plus
+    'modified_batch' (a list of at most MAX_BATCH 'modified' dicts) to score a
+    sweep in one call; those results are returned under 'batch' in the same order.
     """
     # If JSON (AJAX from sliders), merge base_inputs + modified (modified takes precedence)
+    batch_results = None
     if request.is_json:
         payload = request.get_json()
-        base_inputs = payload.get("base_inputs", {})
-        modified = payload.get("modified", {})
-        # Convert all values to numeric and merge
-        merged = {}
-        # base
-        for k, v in base_inputs.items():
-            merged[k] = to_number(v)
-        # modified (these might be model-column keys or form keys)
-        for k, v in modified.items():
-            # if modified key is a model column name and maps to a form key, set the form key
-            if k in MODEL_TO_FORM:
-                merged[MODEL_TO_FORM[k]] = to_number(v)
-            else:
-                # otherwise set directly — build_model_dfs can fallback on model column names
-                merged[k] = to_number(v)
-        user_inputs = merged
+        base_inputs = {k: to_number(v) for k, v in payload.get("base_inputs", {}).items()}
+        user_inputs = merge_modified_inputs(base_inputs, payload.get("modified", {}))
+        # Optional slider sweep: each entry is applied to base_inputs on its own
+        # and all of them are scored in one batched pass.
+        modified_batch = payload.get("modified_batch", [])
+        if not isinstance(modified_batch, list) or not all(isinstance(m, dict) for m in modified_batch):
+            return json_response({"error": "modified_batch must be a list of objects"}, status=400)
+        if len(modified_batch) > MAX_BATCH:
+            return json_response({"error": f"modified_batch accepts at most {MAX_BATCH} entries"}, status=400)
+        if modified_batch:
+            batch_results = predict_many([merge_modified_inputs(base_inputs, m) for m in modified_batch])
     else:
         # Standard form POST
         user_inputs = build_user_inputs(request.form)
 
-    # Build model dataframes for each RF model
-    uci_df, fram_df = build_model_dfs(user_inputs)
-
-    # Compute probabilities
-    uci_prob, fram_prob = get_probabilities(uci_df, fram_df)
-
-    # Meta-model final probability (meta expects columns p_uci, p_fram)
-    meta_df = pd.DataFrame([[uci_prob, fram_prob]], columns=["p_uci", "p_fram"])
-    try:
-        final_prob = float(meta_model.predict_proba(meta_df)[0][1])
-    except Exception:
-        # if meta_model lacks predict_proba fallback to predict (0/1)
-        final_prob = float(meta_model.predict(meta_df)[0])
+    # Build model input rows for each RF model and run base + meta models
+    uci_row, fram_row = build_model_rows(user_inputs)
+    uci_prob, fram_prob, final_prob = predict_rows(uci_row, fram_row)
 
     final_cat = risk_category(final_prob)
 
-    # Determine top 10 features by RF importances (no SHAP)
-    top_features = combine_feature_importances(top_n=10)
+    # Top 10 features by RF importances (no SHAP), precomputed at load
+    top_features = TOP_FEATURES_CACHED
 
-    # For each top feature, get value (from user_inputs) to prefill sliders
-    top_features_with_values = []
-    for feat in top_features:
-        val = get_value_for_feature_name(feat, user_inputs)
-        top_features_with_values.append({"name": feat, "value": val})
+    # If JSON request (slider update), return JSON so result page can update dynamically
+    if request.is_json:
+        response = {
+            "uci_prob": round(uci_prob, 4),
+            "fram_prob": round(fram_prob, 4),
+            "final_prob": round(final_prob, 4),
+            "final_cat": final_cat,
+            "top_features": top_features,
+            "tips": TIPS_CACHED
+        }
+        if batch_results is not None:
+            response["batch"] = batch_results
+        return json_response(response)
 
-    # Generate dynamic tips for the top features
-    tips = get_dynamic_tips(top_features)
+    # One entry per top feature with its current value (slider prefill)
+    top_feature_payload = build_top_feature_payload(user_inputs)
 
     # Prepare context for template
     context = {
         "final_prob": round(final_prob, 4),
         "final_cat": final_cat,
-        "top_features": top_features,                     # list of strings (model-style names)
-        "top_features_values": top_features_with_values,  # list of dicts for initial slider values
-        "base_inputs": user_inputs,                       # keys are form field names (to fill other defaults)
-        "tips": tips,
+        "top_features": top_features,                # list of strings (model-style names)
+        "top_features_values": top_feature_payload,  # list of dicts for initial slider values
+        "base_inputs": user_inputs,                  # keys are form field names (to fill other defaults)
+        "tips": TIPS_CACHED,                         # same {feature, tip} dicts as the JSON response
         "who_link": WHO_LINK
     }
 
-    # If JSON request (slider update), return JSON so result page can update dynamically
-    if request.is_json:
-        return jsonify({
-            "uci_prob": round(uci_prob, 4),
-            "fram_prob": round(fram_prob, 4),
-            "final_prob": round(final_prob, 4),
-            "final_cat": final_cat,
-            "top_features": top_features,
-            "tips": tips
-        })
-
     # Render result page
     return render_template("result.html", **context)
 
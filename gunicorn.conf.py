@@ -0,0 +1,7 @@
+# gunicorn.conf.py
+# Read automatically by `gunicorn app:app` when started from the project root.
+
+# Import app.py (which loads and warms up the models) once in the master so
+# forked workers share the loaded forests copy-on-write instead of each
+# loading their own copy.
+preload_app = True